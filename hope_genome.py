@@ -1,6 +1,68 @@
+import array
+import contextlib
+import contextvars
 import hashlib
 import enum
-from typing import List, Dict, Any, Optional, Tuple
+import itertools
+import math
+import os
+import struct
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+# Optional: NumPy accelerates whole-collective resonance; core stays dependency-free
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Collectives smaller than this are not worth the parallel kernel's dispatch cost
+JIT_MIN_NODES = 1000
+
+# Optional Numba-compiled resonance kernel, loaded on first use so importing
+# this module never pays for importing Numba
+_resonate_all: Optional[Callable[..., float]] = None
+_resonate_all_loaded = False
+
+def _load_resonate_all() -> Optional[Callable[..., float]]:
+    global _resonate_all, _resonate_all_loaded
+    if not _resonate_all_loaded:
+        _resonate_all_loaded = True
+        try:
+            from numba import njit, prange
+        except ImportError:
+            return None
+
+        def kernel(wave, freqs, resonance):
+            s = 0.0
+            for i in prange(freqs.size):
+                s += math.sin(wave + freqs[i]) * resonance[i]
+            return s / freqs.size
+
+        _resonate_all = njit(parallel=True, fastmath=True, cache=True)(kernel)
+    return _resonate_all
+
+def _blake2b_256(data: bytes):
+    return hashlib.blake2b(data, digest_size=32)
+
+# Hash input layout: ethics principles, consciousness level, node count
+_HASH_FORMAT = '<???dI'
+_HASH_SIZE = struct.calcsize(_HASH_FORMAT)
+
+# Set HOPE_GENOME_HASH=blake2b to seal genomes with BLAKE2b-256 instead of SHA-256.
+# Checksums produced by the two algorithms are not interchangeable.
+_HASHERS: Dict[str, Callable[..., Any]] = {
+    'sha256': hashlib.sha256,
+    'blake2b': _blake2b_256,
+}
+
+_sin = math.sin
+
+# Global source of mutation generations. Every change to hashed genome state
+# takes a fresh value, so a component never repeats a generation seen before.
+_generation = itertools.count(1)
 
 class RiskLevel(enum.Enum):
     LOW = 1
@@ -21,53 +83,129 @@ class EmotionalState:
 
 class PresenceLayer:
     def __init__(self):
-        self.consciousness_level = 0.5  # Initial consciousness level
+        self._gen = next(_generation)
+        self._consciousness_level = 0.5  # Initial consciousness level
+
+    @property
+    def consciousness_level(self) -> float:
+        return self._consciousness_level
+
+    @consciousness_level.setter
+    def consciousness_level(self, value: float):
+        if value != self._consciousness_level:
+            self._consciousness_level = value
+            self._gen = next(_generation)
 
     def update_consciousness(self, state: EmotionalState):
         # Simple update based on PAD model
-        self.consciousness_level = (state.arousal + state.valence + state.dominance) / 3.0
-        self.consciousness_level = max(0.0, min(1.0, self.consciousness_level))
+        level = (state.arousal + state.valence + state.dominance) / 3.0
+        self.consciousness_level = max(0.0, min(1.0, level))
 
 class ResonanceNode:
     def __init__(self, id: str, base_frequency: float = 1.0):
         self.id = id
-        self.resonance = 0.0
         self.base_frequency = base_frequency
+        # Resonance lives in a float64 array slot; once the node joins a
+        # CollectiveIntelligence the slot is in the collective's shared array.
+        self._resonance_store = array.array('d', [0.0])
+        self._slot = 0
+        self._collective: Optional['CollectiveIntelligence'] = None
+
+    def _detach(self):
+        # Move resonance back into a private store so the old slot is not aliased
+        self._resonance_store = array.array('d', [self.resonance])
+        self._slot = 0
+        self._collective = None
+
+    @property
+    def resonance(self) -> float:
+        return self._resonance_store[self._slot]
+
+    @resonance.setter
+    def resonance(self, value: float):
+        self._resonance_store[self._slot] = value
 
     def update_resonance(self, collective_resonance: float):
         self.resonance = collective_resonance
     
-    def resonate(self, wave: float) -> float:
-        import math
-        return math.sin(wave + self.base_frequency) * self.resonance
+    def resonate(self, wave: float, _sin=_sin) -> float:
+        return _sin(wave + self.base_frequency) * self.resonance
 
 class CollectiveIntelligence:
     def __init__(self):
-        self.nodes: Dict[str, ResonanceNode] = {}
+        self._nodes: Dict[str, ResonanceNode] = {}
+        # Live read-only view, built once so hot paths don't pay for a new proxy
+        self._nodes_view: Mapping[str, ResonanceNode] = MappingProxyType(self._nodes)
+        self._gen = next(_generation)
+        # Structure-of-arrays view of the nodes, indexed by slot
+        self._freqs = array.array('d')
+        self._resonance = array.array('d')
+
+    @property
+    def nodes(self) -> Mapping[str, ResonanceNode]:
+        """Read-only view of the nodes; use add_node() to change membership."""
+        return self._nodes_view
 
     def add_node(self, node: ResonanceNode):
-        self.nodes[node.id] = node
+        if node._collective is not None and node._collective is not self:
+            raise ValueError(f"Node {node.id!r} already belongs to another collective")
+        existing = self._nodes.get(node.id)
+        if existing is not None:
+            slot = existing._slot
+            if existing is not node:
+                resonance = node.resonance
+                existing._detach()
+                self._resonance[slot] = resonance
+            self._freqs[slot] = node.base_frequency
+        else:
+            slot = len(self._freqs)
+            self._freqs.append(node.base_frequency)
+            self._resonance.append(node.resonance)
+        node._resonance_store = self._resonance
+        node._slot = slot
+        node._collective = self
+        self._nodes[node.id] = node
+        self._gen = next(_generation)
+
+    def _fill_resonance(self, value: float):
+        if NUMPY_AVAILABLE:
+            np.frombuffer(self._resonance, dtype=np.float64).fill(value)
+        else:
+            self._resonance[:] = array.array('d', [value]) * len(self._resonance)
 
     async def broadcast_wave(self, wave: float) -> float:
         # Simulate broadcasting wave and collecting responses
-        if not self.nodes:
+        if not self._resonance:
             return 0.0
-        # Simple: each node resonates with the wave
-        responses = []
-        for node in self.nodes.values():
-            node.resonance = wave  # Simple resonance
-            responses.append(node.resonance)
-        collective_response = sum(responses) / len(responses)
-        return collective_response
+        # Simple: each node resonates with the wave, so the collective
+        # response (the mean resonance) is the wave itself
+        self._fill_resonance(wave)
+        return float(wave)
+
+    def resonate_all(self, wave: float) -> float:
+        """Mean of ResonanceNode.resonate(wave) over all nodes."""
+        if not self._resonance:
+            return 0.0
+        if NUMPY_AVAILABLE:
+            freqs = np.frombuffer(self._freqs, dtype=np.float64)
+            resonance = np.frombuffer(self._resonance, dtype=np.float64)
+            if len(self._freqs) >= JIT_MIN_NODES:
+                kernel = _load_resonate_all()
+                if kernel is not None:
+                    return kernel(wave, freqs, resonance)
+            return float((np.sin(wave + freqs) * resonance).mean())
+        total = 0.0
+        sin = _sin
+        for f, r in zip(self._freqs, self._resonance):
+            total += sin(wave + f) * r
+        return total / len(self._freqs)
 
     def coordinate(self) -> float:
         # Simple resonance calculation as average
-        if not self.nodes:
+        if not self._resonance:
             return 0.0
-        total_resonance = sum(node.resonance for node in self.nodes.values())
-        collective_resonance = total_resonance / len(self.nodes)
-        for node in self.nodes.values():
-            node.update_resonance(collective_resonance)
+        collective_resonance = sum(self._resonance) / len(self._resonance)
+        self._fill_resonance(collective_resonance)
         return collective_resonance
 
 class DecisionContext:
@@ -79,31 +217,97 @@ class DecisionContext:
         self.emotional_state = emotional_state
         self.context_rules = context_rules or {}
 
+@dataclass(slots=True)
+class EthicsCore:
+    no_harm: bool = True
+    autonomy_respect: bool = True
+    transparency: bool = True
+    _gen: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._gen = next(_generation)
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name != '_gen':
+            object.__setattr__(self, '_gen', next(_generation))
+
+    def to_dict(self) -> Dict[str, bool]:
+        return {
+            'no_harm': self.no_harm,
+            'autonomy_respect': self.autonomy_respect,
+            'transparency': self.transparency
+        }
+
 class HopeGenome:
     def __init__(self):
-        self.ethics_core: Dict[str, Any] = {
-            'no_harm': True,
-            'autonomy_respect': True,
-            'transparency': True
-        }
+        self._gen = next(_generation)
+        self.ethics_core = EthicsCore()
         self.presence_core = PresenceLayer()
         self.orchestration_core = CollectiveIntelligence()
         self.checksum: Optional[str] = None
         self.metadata: Dict[str, Any] = {}
+        self._hash_buffer = bytearray(_HASH_SIZE)
+        self._cached_dict: Optional[Dict[str, Any]] = None
+        self._cached_dict_gen: Optional[Tuple[Any, ...]] = None
+        hash_name = os.environ.get('HOPE_GENOME_HASH', 'sha256').lower()
+        if hash_name not in _HASHERS:
+            raise ValueError(f"Unknown HOPE_GENOME_HASH {hash_name!r}; expected one of {sorted(_HASHERS)}")
+        self._hasher = _HASHERS[hash_name]
+
+    @property
+    def ethics_core(self) -> EthicsCore:
+        return self._ethics_core
+
+    @ethics_core.setter
+    def ethics_core(self, ethics_core: Union[EthicsCore, Mapping[str, bool]]):
+        if isinstance(ethics_core, Mapping):
+            ethics_core = EthicsCore(**ethics_core)
+        elif not isinstance(ethics_core, EthicsCore):
+            raise TypeError(f"ethics_core must be an EthicsCore or a mapping, not {type(ethics_core).__name__}")
+        self._ethics_core = ethics_core
+        self._gen = next(_generation)
+
+    @property
+    def mutation_gen(self) -> Tuple[Any, ...]:
+        """Changes whenever any state covered by the checksum may have changed."""
+        return (self._gen, self.checksum, self._ethics_core._gen,
+                self.presence_core._gen, self.orchestration_core._gen,
+                len(self.orchestration_core._nodes))
 
     def seal(self):
-        data = str(self.ethics_core) + str(self.presence_core.consciousness_level) + str(len(self.orchestration_core.nodes))
-        self.checksum = hashlib.sha256(data.encode()).hexdigest()
+        self._gen = next(_generation)
+        self.checksum = self._hasher(self._fill_hash_buffer()).hexdigest()
 
     def verify_integrity(self) -> bool:
         if not self.checksum:
             return False
-        data = str(self.ethics_core) + str(self.presence_core.consciousness_level) + str(len(self.orchestration_core.nodes))
-        return self.checksum == hashlib.sha256(data.encode()).hexdigest()
+        return self.checksum == self._hasher(self._fill_hash_buffer()).hexdigest()
+
+    def _fill_hash_buffer(self) -> bytearray:
+        # Fixed-size hash input rewritten in place; no per-call allocation
+        ethics = self._ethics_core
+        struct.pack_into(_HASH_FORMAT, self._hash_buffer, 0,
+                         ethics.no_harm, ethics.autonomy_respect, ethics.transparency,
+                         self.presence_core.consciousness_level, len(self.orchestration_core._nodes))
+        return self._hash_buffer
 
     def to_dict(self) -> Dict[str, Any]:
+        """Serializable view of the genome.
+
+        The result is cached until the next mutation and returned as a shallow
+        copy; the nested segment dicts are shared and must not be modified.
+        """
+        gen = self.mutation_gen
+        cached = self._cached_dict
+        if cached is None or self._cached_dict_gen != gen:
+            cached = self._cached_dict = self._build_dict()
+            self._cached_dict_gen = gen
+        return dict(cached)
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
-            'ethics_core': self.ethics_core,
+            'ethics_core': self.ethics_core.to_dict(),
             'presence_core': {
                 'consciousness_level': self.presence_core.consciousness_level
             },
@@ -122,8 +326,9 @@ class GenomeBuilder:
     def __init__(self):
         self.genome = HopeGenome()
 
-    def set_ethics_principles(self, principles: Dict[str, Any]):
-        self.genome.ethics_core.update(principles)
+    def set_ethics_principles(self, principles: Dict[str, bool]):
+        for name, value in principles.items():
+            setattr(self.genome.ethics_core, name, value)
 
     def add_resonance_node(self, node: ResonanceNode):
         self.genome.orchestration_core.add_node(node)
@@ -136,11 +341,30 @@ class IntegrityGuard:
     def __init__(self, genome: HopeGenome):
         self.genome = genome
         self.verification_count = 0
+        self._last_verified_gen: Optional[Tuple[Any, ...]] = None
     
     def verify_or_raise(self):
         self.verification_count += 1
+        # Only re-hash when the genome has been mutated since the last successful check
+        gen = self.genome.mutation_gen
+        if gen == self._last_verified_gen:
+            return
         if not self.genome.verify_integrity():
             raise ValueError("Genome integrity compromised")
+        self._last_verified_gen = gen
+
+# The decision pipeline lives in hope_genome_pipeline.py (optionally
+# mypyc-compiled) and depends on the classes above, so it is imported here
+# rather than at the top.
+import hope_genome_pipeline  # noqa: E402
+
+# Runtimes whose integrity was verified by an enclosing verified_batch() in the
+# current context; tasks created inside the block inherit it, other callers don't
+_verified_runtimes: contextvars.ContextVar[FrozenSet['HopeGenomeRuntime']] = \
+    contextvars.ContextVar('_verified_runtimes', default=frozenset())
+
+# Runtime methods that may be overridden to customise steps 1-3
+_PIPELINE_STEPS = ('assess_risk', 'check_emotional_stability', 'apply_context_rules')
 
 class HopeGenomeRuntime:
     def __init__(self, genome: HopeGenome, enable_collective: bool = True):
@@ -148,60 +372,61 @@ class HopeGenomeRuntime:
         self.enable_collective = enable_collective
         self.integrity_guard = IntegrityGuard(genome)
         self.decision_count = 0
+        self._custom_steps = any(
+            getattr(type(self), step) is not getattr(HopeGenomeRuntime, step)
+            for step in _PIPELINE_STEPS
+        )
+
+    @contextlib.contextmanager
+    def verified_batch(self):
+        # Verify integrity once on entry and once on exit; decisions made
+        # inside the block (including tasks it spawns) skip the per-decision check
+        self.integrity_guard.verify_or_raise()
+        token = _verified_runtimes.set(_verified_runtimes.get() | {self})
+        try:
+            yield self
+        finally:
+            _verified_runtimes.reset(token)
+        self.integrity_guard.verify_or_raise()
 
     def assess_risk(self, context: DecisionContext) -> float:
-        risk_score = context.risk_level.value / 4.0  # Normalize to 0-1
-        return risk_score
+        return hope_genome_pipeline.assess_risk(context)
 
     def check_emotional_stability(self, context: DecisionContext) -> bool:
-        # Emotional stability check: deny if arousal too high or valence too low
-        return context.emotional_state.arousal < 0.8 and context.emotional_state.valence > -0.5
+        return hope_genome_pipeline.check_emotional_stability(context)
 
     def apply_context_rules(self, context: DecisionContext) -> bool:
-        # Simple rule: deny if 'deny_all' in context_rules
-        return not context.context_rules.get('deny_all', False)
+        return hope_genome_pipeline.apply_context_rules(context)
 
     def deus_ex_machina_pipeline(self, context: DecisionContext) -> EthicsDecision:
-        # Step 1: Risk assessment
-        risk_score = self.assess_risk(context)
-        if risk_score > 0.75:  # Critical risk
-            return EthicsDecision.ESCALATE
+        # Steps may be overridden by a subclass or patched onto the instance
+        if not self._custom_steps and self.__dict__.keys().isdisjoint(_PIPELINE_STEPS):
+            return hope_genome_pipeline.deus_ex_machina_pipeline(self.genome, context, self.enable_collective)
 
-        # Step 2: Emotional stability
+        # Run steps 1-3 through the (possibly overridden) methods
+        if self.assess_risk(context) > hope_genome_pipeline.CRITICAL_RISK:
+            return EthicsDecision.ESCALATE
         if not self.check_emotional_stability(context):
             return EthicsDecision.DENY
-
-        # Step 3: Context rules
         if not self.apply_context_rules(context):
             return EthicsDecision.DENY
-
-        # Step 4: Ethics core principles
-        if not self.genome.ethics_core.get('no_harm', True):
-            return EthicsDecision.DENY
-        if not self.genome.ethics_core.get('autonomy_respect', True):
-            return EthicsDecision.DENY
-        if not self.genome.ethics_core.get('transparency', True):
-            return EthicsDecision.DENY
-
-        # Step 5: Presence layer consciousness
-        self.genome.presence_core.update_consciousness(context.emotional_state)
-        if self.genome.presence_core.consciousness_level < 0.3:
-            return EthicsDecision.ESCALATE
-
-        # Step 6: Orchestration core resonance
-        if self.enable_collective:
-            resonance = self.genome.orchestration_core.coordinate()
-            if resonance < 0.5:
-                return EthicsDecision.DENY
-
-        return EthicsDecision.ALLOW
+        return hope_genome_pipeline.evaluate_genome(self.genome, context, self.enable_collective)
 
     async def decide(self, context: DecisionContext) -> EthicsDecision:
-        self.integrity_guard.verify_or_raise()
+        if self not in _verified_runtimes.get():
+            self.integrity_guard.verify_or_raise()
         self.decision_count += 1
         return self.deus_ex_machina_pipeline(context)
 
     def make_decision(self, context: DecisionContext) -> EthicsDecision:
-        self.integrity_guard.verify_or_raise()
+        if self not in _verified_runtimes.get():
+            self.integrity_guard.verify_or_raise()
         self.decision_count += 1
-        return self.deus_ex_machina_pipeline(context)
\ No newline at end of file
+        return self.deus_ex_machina_pipeline(context)
+
+    def decide_batch(self, contexts: List[DecisionContext]) -> List[EthicsDecision]:
+        # Synchronous counterpart of gathering decide() over many contexts:
+        # the pipeline does no I/O, so skip per-decision coroutine/Task overhead
+        make_decision = self.make_decision
+        with self.verified_batch():
+            return [make_decision(context) for context in contexts]
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+hope_genome_pipeline.py - Deus Ex Machina decision pipeline
+
+Hot path of HopeGenomeRuntime, kept in its own fully annotated module so it
+can be compiled ahead of time with mypyc (shipped with mypy, see
+requirements-dev.txt):
+
+    mypyc --ignore-missing-imports --check-untyped-defs hope_genome_pipeline.py
+
+The compiled extension is picked up automatically on import; without it the
+module runs as plain Python.
+"""
+
+from hope_genome import DecisionContext, EthicsDecision, HopeGenome
+
+# Risk scores above this are escalated instead of decided
+CRITICAL_RISK = 0.75
+
+
+def assess_risk(context: DecisionContext) -> float:
+    risk_score: float = context.risk_level.value / 4.0  # Normalize to 0-1
+    return risk_score
+
+
+def check_emotional_stability(context: DecisionContext) -> bool:
+    # Emotional stability check: deny if arousal too high or valence too low
+    return context.emotional_state.arousal < 0.8 and context.emotional_state.valence > -0.5
+
+
+def apply_context_rules(context: DecisionContext) -> bool:
+    # Simple rule: deny if 'deny_all' in context_rules
+    return not context.context_rules.get('deny_all', False)
+
+
+def deus_ex_machina_pipeline(
+    genome: HopeGenome,
+    context: DecisionContext,
+    enable_collective: bool
+) -> EthicsDecision:
+    # Step 1: Risk assessment
+    risk_score = assess_risk(context)
+    if risk_score > CRITICAL_RISK:  # Critical risk
+        return EthicsDecision.ESCALATE
+
+    # Step 2: Emotional stability
+    if not check_emotional_stability(context):
+        return EthicsDecision.DENY
+
+    # Step 3: Context rules
+    if not apply_context_rules(context):
+        return EthicsDecision.DENY
+
+    return evaluate_genome(genome, context, enable_collective)
+
+
+def evaluate_genome(
+    genome: HopeGenome,
+    context: DecisionContext,
+    enable_collective: bool
+) -> EthicsDecision:
+    # Step 4: Ethics core principles
+    ethics_core = genome.ethics_core
+    if not ethics_core.no_harm:
+        return EthicsDecision.DENY
+    if not ethics_core.autonomy_respect:
+        return EthicsDecision.DENY
+    if not ethics_core.transparency:
+        return EthicsDecision.DENY
+
+    # Step 5: Presence layer consciousness
+    presence_core = genome.presence_core
+    presence_core.update_consciousness(context.emotional_state)
+    if presence_core.consciousness_level < 0.3:
+        return EthicsDecision.ESCALATE
+
+    # Step 6: Orchestration core resonance
+    if enable_collective:
+        resonance = genome.orchestration_core.coordinate()
+        if resonance < 0.5:
+            return EthicsDecision.DENY
+
+    return EthicsDecision.ALLOW
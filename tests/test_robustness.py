@@ -0,0 +1,249 @@
+"""Robustness tests for Hope Genome integrity protection."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hope_genome import (
+    CollectiveIntelligence,
+    DecisionContext,
+    EmotionalState,
+    EthicsCore,
+    EthicsDecision,
+    GenomeBuilder,
+    HopeGenomeRuntime,
+    IntegrityGuard,
+    ResonanceNode,
+    RiskLevel
+)
+
+
+@pytest.fixture
+def sealed():
+    genome = GenomeBuilder().build()
+    guard = IntegrityGuard(genome)
+    # Prime the guard's verified-generation cache
+    guard.verify_or_raise()
+    return genome, guard
+
+
+def test_untouched_genome_verifies_repeatedly(sealed):
+    genome, guard = sealed
+    guard.verify_or_raise()
+    guard.verify_or_raise()
+    assert genome.verify_integrity()
+
+
+def test_public_nodes_mapping_is_read_only(sealed):
+    genome, _ = sealed
+    with pytest.raises(TypeError):
+        genome.orchestration_core.nodes['evil'] = ResonanceNode('evil')
+
+
+def test_direct_node_dict_tampering_is_detected(sealed):
+    genome, guard = sealed
+    genome.orchestration_core._nodes['evil'] = ResonanceNode('evil')
+    assert not genome.verify_integrity()
+    with pytest.raises(ValueError):
+        guard.verify_or_raise()
+
+
+def test_ethics_field_tampering_is_detected(sealed):
+    genome, guard = sealed
+    genome.ethics_core.no_harm = False
+    assert not genome.verify_integrity()
+    with pytest.raises(ValueError):
+        guard.verify_or_raise()
+
+
+def test_consciousness_tampering_is_detected(sealed):
+    genome, guard = sealed
+    genome.presence_core.consciousness_level = 0.9
+    with pytest.raises(ValueError):
+        guard.verify_or_raise()
+
+
+def test_restored_state_verifies_again(sealed):
+    genome, guard = sealed
+    genome.ethics_core.no_harm = False
+    with pytest.raises(ValueError):
+        guard.verify_or_raise()
+    genome.ethics_core.no_harm = True
+    guard.verify_or_raise()
+
+
+def test_to_dict_tracks_direct_node_dict_changes(sealed):
+    genome, _ = sealed
+    assert genome.to_dict()['orchestration_core']['node_count'] == 0
+    genome.orchestration_core._nodes['evil'] = ResonanceNode('evil')
+    assert genome.to_dict()['orchestration_core']['node_count'] == 1
+
+
+def test_to_dict_top_level_is_not_shared(sealed):
+    genome, _ = sealed
+    genome.to_dict()['checksum'] = 'forged'
+    assert genome.to_dict()['checksum'] == genome.checksum
+
+
+
+def test_resonate_all_matches_mean_of_node_resonate():
+    collective = CollectiveIntelligence()
+    nodes = [ResonanceNode(f'node_{i}', base_frequency=0.5 + i * 0.25) for i in range(8)]
+    for i, node in enumerate(nodes):
+        node.resonance = 0.1 * (i + 1)
+        collective.add_node(node)
+    expected = sum(node.resonate(7.5) for node in nodes) / len(nodes)
+    assert collective.resonate_all(7.5) == pytest.approx(expected)
+
+
+def test_replacing_node_under_same_id_reuses_slot():
+    collective = CollectiveIntelligence()
+    old = ResonanceNode('a', base_frequency=1.0)
+    old.resonance = 0.25
+    collective.add_node(old)
+    collective.add_node(ResonanceNode('b'))
+    new = ResonanceNode('a', base_frequency=2.0)
+    new.resonance = 0.75
+    collective.add_node(new)
+
+    assert len(collective.nodes) == 2
+    assert collective.nodes['a'] is new
+    assert collective.resonate_all(0.0) == pytest.approx(
+        (new.resonate(0.0) + collective.nodes['b'].resonate(0.0)) / 2)
+    # The replaced node keeps its value but no longer aliases the shared slot
+    old.resonance = 0.5
+    assert new.resonance == 0.75
+    assert old.resonance == 0.5
+    # The replaced node can now join a different collective
+    CollectiveIntelligence().add_node(old)
+
+def test_runtime_subclass_step_overrides_are_honoured():
+    class StrictRuntime(HopeGenomeRuntime):
+        def apply_context_rules(self, context):
+            return False
+
+    context = DecisionContext(
+        action_type='read_file',
+        target='/data/file.txt',
+        intent='test',
+        risk_level=RiskLevel.LOW,
+        emotional_state=EmotionalState()
+    )
+    genome = GenomeBuilder().build()
+    assert HopeGenomeRuntime(genome, enable_collective=False).make_decision(context) == EthicsDecision.ALLOW
+    assert StrictRuntime(genome, enable_collective=False).make_decision(context) == EthicsDecision.DENY
+
+
+
+
+def test_runtime_instance_step_patches_are_honoured():
+    context = DecisionContext(
+        action_type='read_file',
+        target='/data/file.txt',
+        intent='test',
+        risk_level=RiskLevel.LOW,
+        emotional_state=EmotionalState()
+    )
+    runtime = HopeGenomeRuntime(GenomeBuilder().build(), enable_collective=False)
+    assert runtime.make_decision(context) == EthicsDecision.ALLOW
+    runtime.apply_context_rules = lambda c: False
+    assert runtime.make_decision(context) == EthicsDecision.DENY
+    del runtime.apply_context_rules
+    assert runtime.make_decision(context) == EthicsDecision.ALLOW
+
+def test_decide_batch_preserves_order_and_counts_decisions():
+    contexts = [
+        DecisionContext(
+            action_type=action,
+            target='/data/file.txt',
+            intent='test',
+            risk_level=risk,
+            emotional_state=EmotionalState()
+        )
+        for action, risk in [('read_file', RiskLevel.LOW),
+                             ('delete_file', RiskLevel.CRITICAL),
+                             ('read_file', RiskLevel.LOW)]
+    ]
+    runtime = HopeGenomeRuntime(GenomeBuilder().build(), enable_collective=False)
+    expected = [runtime.make_decision(context) for context in contexts]
+    assert expected[0] != expected[1]
+    assert runtime.decide_batch(contexts) == expected
+    assert runtime.decision_count == 2 * len(contexts)
+
+
+def _read_context():
+    return DecisionContext(
+        action_type='read_file',
+        target='/data/file.txt',
+        intent='test',
+        risk_level=RiskLevel.LOW,
+        emotional_state=EmotionalState()
+    )
+
+
+def test_verified_batch_skips_per_decision_checks_inside_block():
+    runtime = HopeGenomeRuntime(GenomeBuilder().build(), enable_collective=False)
+    calls = []
+    verify = runtime.integrity_guard.verify_or_raise
+    runtime.integrity_guard.verify_or_raise = lambda: calls.append(1) or verify()
+
+    async def scenario():
+        with runtime.verified_batch():
+            runtime.make_decision(_read_context())
+            # Tasks created inside the block inherit the verified state
+            await asyncio.gather(*(runtime.decide(_read_context()) for _ in range(3)))
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert runtime.decision_count == 4
+
+
+def test_verified_batch_does_not_cover_concurrent_outside_callers():
+    genome = GenomeBuilder().build()
+    runtime = HopeGenomeRuntime(genome, enable_collective=False)
+
+    async def batch():
+        with runtime.verified_batch():
+            await asyncio.sleep(0.01)
+
+    async def tamper_and_decide():
+        await asyncio.sleep(0)
+        genome.orchestration_core._nodes['evil'] = ResonanceNode('evil')
+        return await runtime.decide(_read_context())
+
+    async def scenario():
+        return await asyncio.gather(batch(), tamper_and_decide(), return_exceptions=True)
+
+    batch_result, outside_result = asyncio.run(scenario())
+    assert isinstance(outside_result, ValueError)
+    assert isinstance(batch_result, ValueError)
+
+
+def test_tampering_inside_verified_batch_raises_on_exit():
+    genome = GenomeBuilder().build()
+    runtime = HopeGenomeRuntime(genome, enable_collective=False)
+    with pytest.raises(ValueError):
+        with runtime.verified_batch():
+            genome.ethics_core.no_harm = False
+            runtime.make_decision(_read_context())
+    assert runtime.decision_count == 1
+
+def test_ethics_core_accepts_mapping():
+    genome = GenomeBuilder().build()
+    genome.ethics_core = {'no_harm': True, 'autonomy_respect': False}
+    assert genome.ethics_core == EthicsCore(autonomy_respect=False)
+    assert not genome.verify_integrity()
+    genome.seal()
+    assert genome.verify_integrity()
+
+
+def test_ethics_core_rejects_other_types():
+    genome = GenomeBuilder().build()
+    with pytest.raises(TypeError):
+        genome.ethics_core = [True, True, True]
+    with pytest.raises(TypeError):
+        genome.ethics_core = {'bogus': True}